@@ -4,6 +4,7 @@ import sys
 import hmac
 import hashlib
 import threading
+import time
 from flask import Flask, request, jsonify
 import discord
 from discord.ext import commands, tasks
@@ -289,7 +290,6 @@ class RetryTip4ServButton(Button):
         self.player_id=player_id; self.points=points
     async def callback(self, interaction):
         key=(interaction.user.id,self.player_id)
-        import time
         now=time.time(); window=3*3600
         attempts=self.retry_tracker.get(key,[])
         attempts=[t for t in attempts if now-t<window]
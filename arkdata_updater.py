@@ -7,13 +7,22 @@ BASE_CSV_PATH = Path(__file__).parent / 'data' / 'CleanArkData.csv'
 if not BASE_CSV_PATH.is_file():
     BASE_CSV_PATH = Path(__file__).parent / 'CleanArkData.csv'
 
-# Load the base Ark data library as a dict of sections -> [ArkItem]
+# (st_mtime_ns, grouped library) from the last CSV parse
+_base_cache = None
+
+# Load the base Ark data library as a dict of sections -> {name: ArkItem}
+# The CSV is only re-parsed when it has changed on disk since the last call
 def update_base_library():
-    raw = load_ark_lib(BASE_CSV_PATH)  # likely a dict of section -> [ArkItem]
-    grouped = {}
-    for section, items in raw.items():
-        grouped[section] = {item.name: item for item in items}
-    return grouped
+    global _base_cache
+    mtime = BASE_CSV_PATH.stat().st_mtime_ns
+    if _base_cache is None or _base_cache[0] != mtime:
+        raw = load_ark_lib(BASE_CSV_PATH)  # likely a dict of section -> [ArkItem]
+        grouped = {}
+        for section, items in raw.items():
+            grouped[section] = {item.name: item for item in items}
+        _base_cache = (mtime, grouped)
+    # Fresh section dicts each call: update_full_library merges mod entries into them
+    return {section: dict(items) for section, items in _base_cache[1].items()}
 
 # Load mod JSON files and merge their entries onto the base library
 def update_full_library(mods_path: Path):
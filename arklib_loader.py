@@ -4,7 +4,7 @@ from collections import defaultdict
 from typing import Dict, List
 import csv
 
-@dataclass
+@dataclass(slots=True)
 class ArkItem:
     section: str
     name: str
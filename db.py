@@ -1,10 +1,22 @@
-import pymysql
+import sqlite3
 import json
+import atexit
 
-conn = pymysql.connect("shop.db")
-c = conn.cursor()
+DB_PATH = "shop.db"
+# Applied to every connection: WAL journaling with NORMAL sync moves the fsync
+# cost to checkpoints, and temp tables/indices stay in memory.
+PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+PRAGMA foreign_keys=ON;
+"""
 
-c.execute("""
+# Bump whenever _SCHEMA changes
+SCHEMA_VERSION = 1
+_SCHEMA = """
 CREATE TABLE IF NOT EXISTS transactions (
     id INTEGER PRIMARY KEY,
     player_id TEXT,
@@ -12,9 +24,7 @@ CREATE TABLE IF NOT EXISTS transactions (
     status TEXT,
     source TEXT,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-)
-""")
-c.execute("""
+);
 CREATE TABLE IF NOT EXISTS pending_deliveries (
     id INTEGER PRIMARY KEY,
     player_id TEXT,
@@ -24,9 +34,37 @@ CREATE TABLE IF NOT EXISTS pending_deliveries (
     price INTEGER,
     status TEXT DEFAULT 'pending',
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-)
-""")
-conn.commit()
+);
+"""
+
+# One connection per database file, opened and PRAGMA-configured on first use
+# and kept for the life of the process so the page cache stays warm.
+_conns = {}
+
+def get_conn(path=DB_PATH):
+    conn = _conns.get(path)
+    if conn is None:
+        # Autocommit mode: transactions are only the ones we open explicitly. The
+        # default check_same_thread stays on: the module shares one cursor, unlocked
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.executescript(PRAGMAS)
+        _conns[path] = conn
+    return conn
+
+@atexit.register
+def close_all():
+    while _conns:
+        _conns.popitem()[1].close()
+
+conn = get_conn()
+c = conn.cursor()
+
+# A database already stamped with SCHEMA_VERSION skips the DDL entirely. Each
+# CREATE would otherwise autocommit (and fsync) on its own; group them, and the
+# version stamp, under one explicit BEGIN IMMEDIATE/COMMIT.
+if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+    conn.executescript("BEGIN IMMEDIATE;" + _SCHEMA +
+                       f"PRAGMA user_version={SCHEMA_VERSION};COMMIT;")
 
 def get_eos_for_discord(discord_id):
     return f"eos_{discord_id}"
@@ -39,20 +77,21 @@ def get_balance(player_id):
 def log_transaction(player_id, points, status, source="shop"):
     c.execute("INSERT INTO transactions (player_id, points, status, source) VALUES (?,?,?,?)",
               (player_id, points, status, source))
-    conn.commit()
     return get_balance(player_id)
 
 def queue_delivery(player_id, item_name, command, map_name, price):
     c.execute("INSERT INTO pending_deliveries (player_id, item_name, command, map, price) VALUES (?,?,?,?,?)",
               (player_id, item_name, command, map_name, price))
-    conn.commit()
 
 def deliver_queued_items():
-    c.execute("SELECT id, player_id, command FROM pending_deliveries WHERE status='pending'")
-    rows = c.fetchall(); count=0
-    for id, pid, cmd in rows:
+    # Claim and mark the batch in one write transaction so a concurrent writer
+    # can't slip a row in between the SELECT and the UPDATE; `with conn` commits,
+    # or rolls back if anything raises
+    with conn:
+        c.execute("BEGIN IMMEDIATE")
+        c.execute("SELECT id, player_id, command FROM pending_deliveries WHERE status='pending'")
+        rows = c.fetchall()
         # assume success
-        c.execute("UPDATE pending_deliveries SET status='delivered' WHERE id=?", (id,))
-        count+=1
-    conn.commit()
-    return count
+        c.executemany("UPDATE pending_deliveries SET status='delivered' WHERE id=?",
+                      [(id,) for id, pid, cmd in rows])
+    return len(rows)
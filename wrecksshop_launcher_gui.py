@@ -1,9 +1,19 @@
 import os
 import sys
 import json
+import queue
+import socket
 import subprocess
+import threading
+import time
+import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
+from functools import partial
+from operator import itemgetter
 from tkinter import Canvas, filedialog, messagebox, simpledialog, ttk
+from tkinter import font as tkfont
 from tkinter.scrolledtext import ScrolledText
 from pathlib import Path
 try:
@@ -12,7 +22,7 @@ except ImportError:
     print("Warning: PIL/Pillow not found. Image features will be disabled.")
     Image = None
     ImageTk = None
-from arklib_loader import load_ark_lib, ArkItem
+from arklib_loader import ArkItem
 from arkdata_updater import update_base_library, update_full_library
 import command_builders
 
@@ -33,29 +43,129 @@ if not csv_path.is_file():
     tk.Tk().withdraw()
     messagebox.showerror('Error', f'CleanArkData.csv not found at {csv_path}')
     sys.exit(1)
-ARK_DATA = load_ark_lib(csv_path)
 
-# Config keys for .env
+# Config keys for .env: (key, label, entry width, kind)
+# kind 'secret' masks the entry until the user clicks Show, 'int' only accepts digits
 CONFIG_KEYS = [
-    ('DISCORD_TOKEN', 'Discord Bot Token'),
-    ('SHOP_CHANNEL', 'Discord Shop Channel'),
-    ('SHOP_LOG_CHANNEL_ID', 'Discord Log Channel ID'),
-    ('TIP4SERV_SECRET', 'Tip4Serv Secret (optional)'),
-    ('TIP4SERV_TOKEN', 'Tip4Serv Token (optional)'),
-    ('REWARD_INTERVAL_MINUTES', 'Reward Interval (Minutes)'),
-    ('REWARD_POINTS', 'Reward Amount (Points)')
+    ('DISCORD_TOKEN', 'Discord Bot Token', 50, 'secret'),
+    ('SHOP_CHANNEL', 'Discord Shop Channel', 30, None),
+    ('SHOP_LOG_CHANNEL_ID', 'Discord Log Channel ID', 30, None),
+    ('TIP4SERV_SECRET', 'Tip4Serv Secret (optional)', 50, 'secret'),
+    ('TIP4SERV_TOKEN', 'Tip4Serv Token (optional)', 50, 'secret'),
+    ('REWARD_INTERVAL_MINUTES', 'Reward Interval (Minutes)', 10, 'int'),
+    ('REWARD_POINTS', 'Reward Amount (Points)', 10, 'int')
 ]
 
-def load_modded_library(mods_path: Path):
-    """Scan JSON files in mods_path and merge entries on top of base."""
-    mod_lib = {'dinos': {}, 'items': {}}
-    for f in Path(mods_path).glob('*.json'):
-        data = json.load(f.open('r', encoding='utf-8'))
-        key = 'dinos' if 'Dino' in f.name else 'items'
-        for e in data:
-            idn = e.get('name') or e.get('internalName')
-            mod_lib[key][idn] = e
-    return mod_lib
+# Activity log cap: once past LOG_MAX_LINES the oldest lines are trimmed to LOG_KEEP_LINES
+LOG_MAX_LINES = 1000
+LOG_KEEP_LINES = 500
+# How often queued log lines are written into the Logs page
+LOG_FLUSH_MS = 100
+# Activity log line template, bound once at import
+_fmt_log = "[{ts}] {msg}".format
+# How often finished background tasks are handed to their callbacks on the Tk thread
+RESULT_POLL_MS = 50
+# How often the Control page checks whether the bot process is still alive
+BOT_WATCH_MS = 1000
+# How long a status toast stays up before it clears
+TOAST_MS = 2000
+# Data Library search results kept per section, so a longer term filters a shorter one's hits
+LIB_FILTER_CACHE = 32
+# Data Library rows inserted per event-loop turn; the rest follow in later turns
+LIB_FILL_CHUNK = 200
+# Pause in typing before the Data Library search runs
+LIB_SEARCH_MS = 150
+# Keys whose release can't have changed the search text
+NON_EDIT_KEYS = frozenset({'Shift_L','Shift_R','Control_L','Control_R','Alt_L','Alt_R',
+                           'Meta_L','Meta_R','Super_L','Super_R','Caps_Lock','Num_Lock',
+                           'Left','Right','Up','Down','Home','End','Prior','Next','Tab','Escape'})
+# Quiet period before queued JSON saves are written; edits inside it share one write
+SAVE_DELAY_MS = 200
+
+# Bot status -> (status label style, Start button state, Stop button state)
+BOT_STATUS = {
+    'Running': ('Ok.TLabel', 'disabled', 'normal'),
+    'Stopping...': ('Ok.TLabel', 'disabled', 'disabled'),
+    'Stopped': ('Error.TLabel', 'normal', 'disabled'),
+}
+
+# Shop item 'enabled' flag -> Enabled column text
+ENABLED_TEXT = ('No', 'Yes')
+
+# Main menu button label -> notebook page name
+MENU_PAGES = {'CONFIG':'Configuration','SERVERS':'RCON Servers',
+              'SQL DATABASES':'SQL Databases','SHOP':'Shop Items',
+              'LIBRARY':'Data Library','ADMIN ROLES':'Admin Roles',
+              'DISCOUNTS':'Discounts','CONTROL':'Control','LOGS':'Logs'}
+# Notebook pages, in tab order
+PAGE_NAMES = tuple(MENU_PAGES.values())
+# Main menu grid buttons in layout order (LOGS sits on the bottom bar instead)
+MENU_BUTTONS = ('CONFIG','SERVERS','SQL DATABASES','SHOP','LIBRARY','ADMIN ROLES','DISCOUNTS','CONTROL')
+BOTTOM_BUTTONS = ('START/STOP','LOGS','GITHUB','DISCORD')
+
+def probe_tcp(host, port, timeout=5.0):
+    """Open and close a TCP connection to host:port. Returns (ok, detail); blocking."""
+    # create_connection treats a None/empty host as loopback, which would pass
+    # for any local listener on the same port
+    if not host: return False, 'no host configured'
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return True, f'{host}:{port} is reachable'
+    except (OSError, TypeError, ValueError) as e:
+        return False, f'{host}:{port} is unreachable ({e})'
+
+class MaskedEntry(ttk.Entry):
+    """ttk.Entry that masks its text until revealed; the state lives in Python."""
+    def __init__(self, master=None, mask='*', **kw):
+        super().__init__(master, show=mask, **kw)
+        self._mask = mask
+        self.revealed = False
+
+    def set_revealed(self, revealed):
+        if revealed != self.revealed:
+            self.config(show='' if revealed else self._mask)
+            self.revealed = revealed
+
+class FormDialog(tk.Toplevel):
+    """Modal form with one entry per field. Built once, then re-shown by ask().
+
+    Keys listed in ``masked`` get a MaskedEntry, for passwords.
+    """
+    def __init__(self, master, title, fields, masked=()):
+        super().__init__(master)
+        self.withdraw()
+        self.title(title); self.transient(master); self.resizable(False, False)
+        self.entries = {}
+        for row, (key, label) in enumerate(fields):
+            ttk.Label(self, text=label).grid(row=row, column=0, sticky='w', padx=5, pady=2)
+            self.entries[key] = e = (MaskedEntry if key in masked else ttk.Entry)(self, width=30)
+            e.grid(row=row, column=1, padx=5, pady=2)
+        bf = ttk.Frame(self); bf.grid(row=len(fields), column=0, columnspan=2, pady=5)
+        ttk.Button(bf, text='OK', command=self._ok).pack(side='left', padx=5)
+        ttk.Button(bf, text='Cancel', command=self._close).pack(side='left', padx=5)
+        self.bind('<Return>', lambda e: self._ok())
+        self.bind('<Escape>', lambda e: self._close())
+        self.protocol('WM_DELETE_WINDOW', self._close)
+        self._done = tk.BooleanVar(self)
+        self.result = None
+
+    def ask(self):
+        """Show the form cleared and wait; returns {key: stripped text}, or None if cancelled."""
+        for e in self.entries.values(): e.delete(0, 'end')
+        self.result = None
+        # grab_set fails on X11 until the window is actually mapped
+        self.deiconify(); self.wait_visibility(); self.grab_set()
+        next(iter(self.entries.values())).focus_set()
+        self.wait_variable(self._done)
+        return self.result
+
+    def _ok(self):
+        self.result = {k: e.get().strip() for k, e in self.entries.items()}
+        self._close()
+
+    def _close(self):
+        self.grab_release(); self.withdraw()
+        self._done.set(True)
 
 class WrecksShopLauncher(tk.Tk):
     def __init__(self):
@@ -65,6 +175,16 @@ class WrecksShopLauncher(tk.Tk):
         self.geometry('1024x768')
         self.configure(bg='#ffffff')
         self.config_path = os.path.join(os.getcwd(), "wrecksshop_config.json")
+        # Shared pool for blocking work (process shutdown, network probes, file I/O)
+        self._workers = ThreadPoolExecutor(max_workers=4, thread_name_prefix='wrecksshop')
+        # Single thread for store writes, so writes to one file land in the order queued
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wrecksshop-io')
+        # (done, result) pairs from finished tasks; Tk calls can't be made from the pools
+        self._results = queue.Queue()
+        # Tasks submitted by _run_async that haven't been drained yet, and the poll
+        # that drains them; it only runs while the count is non-zero
+        self._in_flight = 0
+        self._results_id = None
         # Icon & header
         try:
             self.iconphoto(False, tk.PhotoImage(file=ICON_PATH))
@@ -72,30 +192,44 @@ class WrecksShopLauncher(tk.Tk):
             pass
         # Load assets
         self._load_assets()
-        self.config_data = self.load_config()
+        self._init_styles()
+        self._config_data = None
+        self.env_values = {}
+        self.servers = []
+        self.databases = []
+        self._db_index = {}
+        self._db_refresh_id = None
+        self._env_saved = None
+        # path -> st_mtime_ns when a JSON store was last read or written by us
+        self._json_mtimes = {}
+        # path -> writes queued on the writer thread that haven't reported back yet
+        self._writes_in_flight = {}
+        # Saves queued by _schedule_save, written together by _flush_saves
+        self._pending_saves = set()
+        self._save_id = None
+        self.config_entries = {}
+        # status label -> pending after() id that clears it; see _toast
+        self._toast_ids = {}
+        # Key-by-key validator for numeric entries
+        self._vcmd_int = (self.register(self._is_int), '%P')
         # Build UI
         self._build_main_menu()
         self._build_notebook()
-        self._build_shop_page()
         # Load data
         self._load_env()
-        self.library = update_base_library()
-        self.player_id_var = tk.IntVar(value=1)
-        self.eos_id_var = tk.StringVar()
-        self.qty_var = tk.IntVar(value=1)
-        self.quality_var = tk.IntVar(value=1)
-        self.is_blueprint_var = tk.BooleanVar(value=False)
-        self.level_var = tk.IntVar(value=224)
-        self.breedable_var = tk.BooleanVar(value=True)
+        # Parsing the Ark CSV happens on the worker pool; until it lands the library is empty
+        self._set_library({})
+        self._run_async(update_base_library, done=partial(self._library_loaded, None))
         # Initial loads
         self._load_servers()
-        self._load_databases()
-        self._refresh_shop_items()
+        self._load_shop_store()
         self._load_admin_roles()
         self._load_discounts()
-        self._populate_library_types()
         # Bot process handle
         self.process = None
+        self._stopping = False
+        self._watch_id = None
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
 
     def _load_assets(self):
         if Image and ImageTk and os.path.exists(LOGO_PATH):
@@ -108,6 +242,21 @@ class WrecksShopLauncher(tk.Tk):
         else:
             self.logo_img = None
 
+    def _init_styles(self):
+        """Create the shared ttk styles and named fonts once for every page."""
+        self.style = ttk.Style(self)
+        self.style.configure('Ok.TLabel', foreground='green')
+        self.style.configure('Error.TLabel', foreground='red')
+        self.title_font = tkfont.Font(self, family='Montserrat', size=24, weight='bold')
+        self.mono_font = tkfont.Font(self, family='Consolas', size=10)
+
+    @property
+    def config_data(self):
+        # Nothing needs wrecksshop_config.json to draw the window; read it on first use
+        if self._config_data is None:
+            self._config_data = self.load_config()
+        return self._config_data
+
     def load_config(self):
         if os.path.exists(self.config_path):
             with open(self.config_path, 'r') as f:
@@ -124,19 +273,17 @@ class WrecksShopLauncher(tk.Tk):
         # Gradient
         for i, color in enumerate(['#8F2EFF', '#64C7FF']):
             c.create_rectangle(0, i*384, 1024, (i+1)*384, fill=color, outline='')
-        c.create_text(20, 20, anchor='nw', text='WrecksShop', fill='white', font=('Montserrat',24,'bold'))
+        c.create_text(20, 20, anchor='nw', text='WrecksShop', fill='white', font=self.title_font)
         if self.logo_img:
             c.create_image(980, 20, anchor='ne', image=self.logo_img)
-        labels = ['CONFIG','SERVERS','SQL DATABASES','SHOP','LIBRARY','ADMIN ROLES','DISCOUNTS','CONTROL']
-        for idx, lbl in enumerate(labels):
+        for idx, lbl in enumerate(MENU_BUTTONS):
             col = idx % 4
             row = idx // 4
             x = 50 + col*240
             y = 150 + row*250
             btn = ttk.Button(self, text=lbl, command=lambda L=lbl: self._show_tab(L))
             btn.place(x=x, y=y, width=200, height=100)
-        bottom = ['START/STOP','LOGS','GITHUB','DISCORD']
-        for i, lbl in enumerate(bottom):
+        for i, lbl in enumerate(BOTTOM_BUTTONS):
             x = 50 + i*240
             btn = ttk.Button(self, text=lbl, command=lambda L=lbl: self._bottom_action(L))
             btn.place(x=x, y=680, width=200, height=60)
@@ -145,146 +292,348 @@ class WrecksShopLauncher(tk.Tk):
     def _build_notebook(self):
         self.nb = ttk.Notebook(self)
         self.pages = {}
-        page_names = ['Configuration','RCON Servers','SQL Databases','Shop Items',
-                      'Data Library','Admin Roles','Discounts','Control','Logs']
-        for name in page_names:
+        for name in PAGE_NAMES:
             frame = ttk.Frame(self.nb)
             self.nb.add(frame, text=name)
             self.pages[name] = frame
         self.nb.place_forget()
+        # Pages built on first activation instead of at startup
+        self._lazy_pages = {'Configuration': self._build_config_page,
+                            'Data Library': self._build_library_page}
+        # Pages backed by a JSON store: re-checked against disk when the page is shown
+        self._page_loaders = {'Shop Items': self._load_shop_store,
+                              'Admin Roles': self._load_admin_roles,
+                              'Discounts': self._load_discounts}
+        # Adding the tabs queued a <<NotebookTabChanged>> for the first one; bind only
+        # once it has gone by, or it would build that lazy page at startup
+        self.after_idle(self.nb.bind, '<<NotebookTabChanged>>', self._on_tab_changed)
         # Build pages
-        self._build_config_page()
         self._build_servers_page()
         self._build_databases_page()
         self._build_shop_page()
-        self._build_library_page()
         self._build_admins_page()
         self._build_discounts_page()
         self._build_control_page()
         self._build_logs_page()
 
+    def _schedule_save(self, save):
+        """Queue save() to run after SAVE_DELAY_MS; repeat calls inside the window write once."""
+        self._pending_saves.add(save)
+        if self._save_id is None:
+            self._save_id = self.after(SAVE_DELAY_MS, self._flush_saves)
+
+    def _flush_saves(self):
+        if self._save_id is not None:
+            self.after_cancel(self._save_id); self._save_id = None
+        while self._pending_saves:
+            self._pending_saves.pop()()
+
+    def _on_close(self):
+        # Don't lose edits still waiting out the save delay, or writes still queued
+        self._flush_saves()
+        self._writer.shutdown(wait=True)
+        self._workers.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
+    def _run_async(self, fn, *args, done=None, pool=None):
+        """Run fn(*args) on the worker pool and pass its result to done() on the Tk thread.
+
+        The result is queued and picked up by _drain_results, so this works before
+        mainloop starts and is harmless after the window is destroyed. Must be called
+        on the Tk thread.
+
+        fn must not touch widgets. Exceptions are reported to the activity log.
+        pool overrides the executor (default: the shared worker pool).
+        """
+        def _finished(fut):
+            # Every task reports back, even without a callback, so _in_flight stays exact
+            result = None
+            if fut.cancelled(): callback = None  # dropped by _on_close
+            else:
+                try:
+                    result = fut.result(); callback = done
+                except Exception as e:
+                    self._log(f"Background task failed: {e}"); callback = None
+            self._results.put((callback, result))
+        future = (pool or self._workers).submit(fn, *args)
+        self._in_flight += 1
+        if self._results_id is None:
+            self._results_id = self.after(RESULT_POLL_MS, self._drain_results)
+        future.add_done_callback(_finished)
+        return future
+
+    def _drain_results(self):
+        self._results_id = None
+        try:
+            while True:
+                try: done, result = self._results.get_nowait()
+                except queue.Empty: break
+                self._in_flight -= 1
+                if done: done(result)
+        finally:
+            # Keep polling only while a task has yet to report back; a failing
+            # callback leaves the rest of the queue for the next tick
+            if self._in_flight:
+                self._results_id = self.after(RESULT_POLL_MS, self._drain_results)
+
+    def _on_tab_changed(self, event=None):
+        name = self.nb.tab(self.nb.select(), 'text')
+        self._ensure_page(name)
+        self._logs_visible = name == 'Logs'
+        if self._logs_visible: self._drain_log()
+        # Only the page being shown is refreshed; hidden ones catch up when selected
+        loader = self._page_loaders.get(name)
+        if loader: loader()
+
+    def _ensure_page(self, name):
+        """Build a deferred page the first time it is needed."""
+        builder = self._lazy_pages.pop(name, None)
+        if builder:
+            builder()
+
     def _show_tab(self, label):
         self.menu_canvas.place_forget()
         self.nb.place(x=0, y=0, relwidth=1, relheight=1)
-        mapping = {'CONFIG':'Configuration','SERVERS':'RCON Servers',
-                   'SQL DATABASES':'SQL Databases','SHOP':'Shop Items',
-                   'LIBRARY':'Data Library','ADMIN ROLES':'Admin Roles',
-                   'DISCOUNTS':'Discounts','CONTROL':'Control','LOGS':'Logs'}
-        page = mapping.get(label)
+        page = MENU_PAGES.get(label)
         if page:
-            self.nb.select(self.pages[page])
+            # Re-selecting the current tab fires no event, so handle it here
+            if self.nb.select() == str(self.pages[page]): self._on_tab_changed()
+            else: self.nb.select(self.pages[page])
 
     def _bottom_action(self, label):
         if label == 'START/STOP':
             if self.process: self.stop_bot()
             else: self.start_bot()
         elif label == 'LOGS':
-            self._show_tab('Logs')
+            self._show_tab(label)
         elif label == 'GITHUB':
-            import webbrowser; webbrowser.open('https://github.com/bebewat/wrecksshop-main')
+            webbrowser.open('https://github.com/bebewat/wrecksshop-main')
         elif label == 'DISCORD':
-            import webbrowser; webbrowser.open('https://discord.gg/smXr7pQ37V')
+            webbrowser.open('https://discord.gg/smXr7pQ37V')
+
+    @staticmethod
+    def _make_tree(parent, cols):
+        """Headings-only Treeview with one column per name, packed to fill parent."""
+        tv = ttk.Treeview(parent, columns=cols, show='headings')
+        for c in cols: tv.heading(c, text=c)
+        tv.pack(expand=True, fill='both', pady=5)
+        return tv
+
+    @staticmethod
+    def _fill_named_tree(tv, entries, row):
+        """Rebuild tv with row(entry) for each entry; returns the name -> entry index."""
+        tv.delete(*tv.get_children())
+        # Names are unique, so they double as Treeview iids and index keys
+        index = {}
+        for e in entries: index.setdefault(e['name'], e)
+        rows = [(name, row(e)) for name, e in index.items()]
+        insert = tv.insert
+        for name, values in rows:
+            insert('', 'end', iid=name, values=values)
+        return index
 
     # Configuration Page
     def _build_config_page(self):
         f = self.pages['Configuration']
         self.config_entries = {}
-        for i, (k, l) in enumerate(CONFIG_KEYS):
-            ttk.Label(f, text=l).grid(row=i, column=0, sticky='w', pady=4)
-            e = ttk.Entry(f, width=40)
-            e.grid(row=i, column=1, pady=4)
-            self.config_entries[k] = e
+        # Row padding is set once for the whole form rather than per widget
+        f.grid_rowconfigure(tuple(range(len(CONFIG_KEYS))), pad=8)
+        for i, row in enumerate(CONFIG_KEYS):
+            self._add_config_row(f, i, *row)
         ttk.Button(f, text='Save Settings', command=self._save_env).grid(row=len(CONFIG_KEYS), column=0, columnspan=2, pady=10)
+        self.config_status = ttk.Label(f, text='', style='Ok.TLabel')
+        self.config_status.grid(row=len(CONFIG_KEYS), column=2, sticky='w')
+        self._fill_config_entries()
+
+    def _add_config_row(self, parent, row, key, label, width, kind):
+        secret = kind == 'secret'
+        ttk.Label(parent, text=label).grid(row=row, column=0, sticky='w')
+        e = MaskedEntry(parent, width=width) if secret else ttk.Entry(parent, width=width)
+        if kind == 'int':
+            e.config(validate='key', validatecommand=self._vcmd_int)
+        e.grid(row=row, column=1, sticky='w')
+        if secret:
+            btn = ttk.Button(parent, text='Show', width=6)
+            btn.config(command=partial(self._toggle_visibility, e, btn))
+            btn.grid(row=row, column=2, padx=4)
+        self.config_entries[key] = e
+        return e
+
+    @staticmethod
+    def _is_int(value):
+        return value == '' or value.isdecimal()
+
+    def _toggle_visibility(self, entry, btn):
+        shown = not entry.revealed
+        entry.set_revealed(shown)
+        btn.config(text='Hide' if shown else 'Show')
+
+    def _toast(self, label, msg):
+        """Show msg in a status label for TOAST_MS, then clear it. Non-modal, unlike a messagebox."""
+        label.config(text=msg)
+        after_id = self._toast_ids.pop(label, None)
+        if after_id: self.after_cancel(after_id)
+        self._toast_ids[label] = self.after(TOAST_MS, self._clear_toast, label)
+
+    def _clear_toast(self, label):
+        del self._toast_ids[label]
+        label.config(text='')
+
+    def _fill_config_entries(self):
+        # Validation is paused so a non-numeric .env value is shown as-is, not dropped
+        for k, e in self.config_entries.items():
+            validate = e.cget('validate'); e.config(validate='none')
+            e.delete(0,'end'); e.insert(0, self.env_values.get(k, ''))
+            e.config(validate=validate)
 
     def _load_env(self):
         if os.path.exists(ENV_PATH):
             data = dict(line.strip().split('=',1) for line in open(ENV_PATH) if '=' in line)
-            for k, e in self.config_entries.items():
-                e.delete(0,'end'); e.insert(0, data.get(k, ''))
+            self.env_values = data
+            self._env_saved = [f"{k}={v}" for k, v in data.items()]
+            self._fill_config_entries()
             self.servers = json.loads(data.get('RCON_SERVERS','[]'))
             self.databases = json.loads(data.get('SQL_DATABASES','[]'))
-            if os.path.exists(SHOP_ITEMS_PATH):
-                shop = json.load(open(SHOP_ITEMS_PATH)); self.categories = list(shop.keys())
+            self._refresh_databases()
 
     def _save_env(self):
-        out = {k: e.get() for k, e in self.config_entries.items()}
+        self._ensure_page('Configuration')
+        # Read and strip each entry once; pasted tokens often carry stray whitespace
+        out = {k: e.get().strip() for k, e in self.config_entries.items()}
         out['RCON_SERVERS'] = self.servers; out['SQL_DATABASES'] = self.databases
+        lines = [f"{k}={json.dumps(v) if isinstance(v,list) else v}" for k, v in out.items()]
+        if lines == self._env_saved:
+            self._toast(self.config_status, 'No changes'); return
         with open(ENV_PATH,'w') as f:
-            for k, v in out.items():
-                f.write(f"{k}={json.dumps(v) if isinstance(v,list) else v}\n")
-        messagebox.showinfo('Saved','Configuration saved')
+            f.write('\n'.join(lines) + '\n')
+        self._env_saved = lines
+        self._toast(self.config_status, 'Saved')
         self._log('Configuration saved')
 
     # RCON Servers Page
     def _build_servers_page(self):
         f = self.pages['RCON Servers']
-        cols = ('Name','Host','Port','Password')
-        self.srv_tv = ttk.Treeview(f, columns=cols, show='headings')
-        for c in cols: self.srv_tv.heading(c, text=c)
-        self.srv_tv.pack(expand=True, fill='both', pady=5)
+        self.srv_tv = self._make_tree(f, ('Name','Host','Port','Password','Status'))
         btnf = ttk.Frame(f); btnf.pack()
         ttk.Button(btnf, text='Add Server', command=self._add_server).pack(side='left', padx=5)
         ttk.Button(btnf, text='Remove Server', command=self._remove_server).pack(side='left', padx=5)
+        ttk.Button(btnf, text='Test Connection', command=self._test_servers).pack(side='left', padx=5)
+        # Add dialog, created on first use and kept for later ones
+        self._srv_form = None
+
+    @staticmethod
+    def _srv_row(s):
+        """Treeview values for a server: password masked, status not yet tested."""
+        return (s['name'], s['host'], s['port'], '*'*len(s['password'] or ''), '')
 
     def _load_servers(self):
-        for s in getattr(self,'servers', []):
-            self.srv_tv.insert('', 'end', values=(s['name'], s['host'], s['port'], '*'*len(s['password'])) )
+        self._srv_index = self._fill_named_tree(self.srv_tv, self.servers, self._srv_row)
 
     def _add_server(self):
-        name = simpledialog.askstring('Server Name','Enter unique server name:')
-        if not name: return
-        host = simpledialog.askstring('Host','Enter RCON host/IP:')
-        port = simpledialog.askinteger('Port','Enter RCON port:')
-        pwd = simpledialog.askstring('Password','Enter RCON password:',show='*')
-        srv = {'name':name,'host':host,'port':port,'password':pwd}
-        self.servers.append(srv)
-        self.srv_tv.insert('', 'end', values=(name,host,port,'*'*len(pwd)))
+        if self._srv_form is None:
+            self._srv_form = FormDialog(self, 'Add Server', [('name','Unique server name:'),('host','RCON host/IP:'),
+                                                            ('port','RCON port:'),('password','RCON password:')],
+                                        masked=('password',))
+        vals = self._srv_form.ask()
+        if not vals or not vals['name']: return
+        name = vals['name']
+        if name in self._srv_index:
+            messagebox.showerror('Error',f'A server named {name} already exists'); return
+        try: port = int(vals['port'])
+        except ValueError: messagebox.showerror('Error','Port must be a whole number'); return
+        srv = {'name':name,'host':vals['host'],'port':port,'password':vals['password']}
+        self.servers.append(srv); self._srv_index[name] = srv
+        self.srv_tv.insert('', 'end', iid=name, values=self._srv_row(srv))
         self._log(f"Added server {name}")
 
     def _remove_server(self):
         sel = self.srv_tv.selection()
         if sel:
-            idx = self.srv_tv.index(sel)
-            name = self.servers.pop(idx)['name']
-            self.srv_tv.delete(sel)
+            name = sel[0]
+            self.servers.remove(self._srv_index.pop(name))
+            self.srv_tv.delete(name)
             self._log(f"Removed server {name}")
 
+    def _test_servers(self):
+        # Every selected server is probed at once on the worker pool; each row
+        # reports its own result as it arrives
+        for name in self.srv_tv.selection():
+            srv = self._srv_index[name]
+            self.srv_tv.set(name, 'Status', 'Testing...')
+            self._run_async(probe_tcp, srv['host'], srv['port'], done=partial(self._server_tested, name))
+
+    def _server_tested(self, name, result):
+        ok, detail = result
+        # The row may have been removed while its probe was in flight
+        if self.srv_tv.exists(name):
+            self.srv_tv.set(name, 'Status', 'Reachable' if ok else 'Unreachable')
+        self._log(f"Server {name}: {detail}")
+
     # SQL Databases Page
     def _build_databases_page(self):
         f = self.pages['SQL Databases']
-        cols = ('Name','Host','Port','User','DB')
-        self.db_tv = ttk.Treeview(f, columns=cols, show='headings')
-        for c in cols: self.db_tv.heading(c,text=c)
-        self.db_tv.pack(expand=True, fill='both', pady=5)
+        self.db_tv = self._make_tree(f, ('Name','Host','Port','User','DB'))
         btnf = ttk.Frame(f); btnf.pack()
         ttk.Button(btnf,text='Add Database',command=self._add_database).pack(side='left',padx=5)
         ttk.Button(btnf,text='Remove Database',command=self._remove_database).pack(side='left',padx=5)
+        self.db_test_btn = ttk.Button(btnf,text='Test Connection',command=self._test_database)
+        self.db_test_btn.pack(side='left',padx=5)
+        self.db_status = ttk.Label(btnf, text='', style='Ok.TLabel')
+        self.db_status.pack(side='left',padx=5)
+
+    def _refresh_databases(self):
+        # Coalesce back-to-back refreshes into one rebuild, run once the UI is idle
+        if self._db_refresh_id: self.after_cancel(self._db_refresh_id)
+        self._db_refresh_id = self.after_idle(self._load_databases)
+
+    # Treeview values for a configured database; the password is never shown
+    _db_row = staticmethod(itemgetter('name','host','port','user','database'))
 
     def _load_databases(self):
-        for db in getattr(self,'databases',[]):
-            self.db_tv.insert('', 'end', values=(db['name'],db['host'],db['port'],db['user'],db['database']))
+        self._db_refresh_id = None
+        self._db_index = self._fill_named_tree(self.db_tv, self.databases, self._db_row)
 
     def _add_database(self):
         name = simpledialog.askstring('DB Name','Enter unique DB name:')
         if not name: return
-        host = simpledialog.askstring('Host','Enter DB host/IP:')
+        if name in self._db_index:
+            messagebox.showerror('Error',f'A database named {name} already exists'); return
+        # A cancelled Host or Port prompt cancels the add; None would be saved otherwise
+        host = (simpledialog.askstring('Host','Enter DB host/IP:') or '').strip()
+        if not host: return
         port = simpledialog.askinteger('Port','Enter DB port:')
+        if port is None: return
         user = simpledialog.askstring('User','Enter DB user:')
         pwd = simpledialog.askstring('Password','Enter DB password:',show='*')
         dbname = simpledialog.askstring('Database','Enter database name:')
         db = {'name':name,'host':host,'port':port,'user':user,'password':pwd,'database':dbname}
-        self.databases.append(db)
-        self.db_tv.insert('', 'end', values=(name,host,port,user,dbname))
+        self.databases.append(db); self._db_index[name] = db
+        self.db_tv.insert('', 'end', iid=name, values=self._db_row(db))
         self._log(f"Added database {name}")
 
     def _remove_database(self):
         sel = self.db_tv.selection()
         if sel:
-            idx = self.db_tv.index(sel)
-            name = self.databases.pop(idx)['name']
-            self.db_tv.delete(sel)
+            name = sel[0]
+            self.databases.remove(self._db_index.pop(name))
+            self.db_tv.delete(name)
             self._log(f"Removed database {name}")
 
+    def _test_database(self):
+        sel = self.db_tv.selection()
+        if not sel: return
+        db = self._db_index[sel[0]]
+        # The handshake can take seconds on a dead host; run it on the worker pool
+        self.db_test_btn.config(state='disabled')
+        self._run_async(probe_tcp, db['host'], db['port'], done=partial(self._database_tested, db['name']))
+
+    def _database_tested(self, name, result):
+        ok, detail = result
+        self.db_test_btn.config(state='normal')
+        self._log(f"Database {name}: {detail}")
+        if ok: self._toast(self.db_status, f"{name}: {detail}")
+        else: messagebox.showerror('Test Connection', detail)
+
     # Shop Items Page
     def _build_shop_page(self):
         # Use the existing pages framework
@@ -294,7 +643,10 @@ class WrecksShopLauncher(tk.Tk):
         ttk.Label(f, text='Category').pack(anchor='w', pady=5)
         self.cat_combo = ttk.Combobox(f, values=self.categories, state='readonly')
         self.cat_combo.pack(fill='x', padx=5)
-        self.cat_combo.bind('<<ComboboxSelected>>', lambda e: self._refresh_shop_items())
+        self.cat_combo.bind('<<ComboboxSelected>>', lambda e: self._on_category_select())
+        # Category whose items are currently in item_tv, and the values of each row
+        self._shown_cat = None
+        self._shown_rows = []
 
         btnf = ttk.Frame(f)
         btnf.pack(pady=5)
@@ -302,66 +654,63 @@ class WrecksShopLauncher(tk.Tk):
         ttk.Button(btnf, text='Toggle Category Enabled', command=self._toggle_category_enabled).pack(side='left', padx=5)
 
         # ---------------- Treeview of Shop Items ----------------
-        cols = ('Name', 'Command', 'Price', 'Limit', 'Roles', 'Enabled', 'Description')
-        self.item_tv = ttk.Treeview(f, columns=cols, show='headings')
-        for c in cols:
-            self.item_tv.heading(c, text=c)
-        self.item_tv.pack(expand=True, fill='both', pady=5)
+        self.item_tv = self._make_tree(f, ('Name', 'Command', 'Price', 'Limit', 'Roles', 'Enabled', 'Description'))
 
         # ---------------- Item Form Section ----------------
         form = ttk.Frame(f)
         form.pack(fill='x', pady=5)
+        form.grid_columnconfigure(tuple(range(6)), pad=8)
 
         # First row: Basic fields
         labels = ['Name', 'Command', 'Price', 'Roles']
         for i, l in enumerate(labels):
-            ttk.Label(form, text=l).grid(row=0, column=i, padx=4)
-        ttk.Label(form, text='Description').grid(row=0, column=5, padx=4)
+            ttk.Label(form, text=l).grid(row=0, column=i)
+        ttk.Label(form, text='Description').grid(row=0, column=5)
 
         self.name_entry = ttk.Entry(form, width=18)
-        self.name_entry.grid(row=1, column=0, padx=4)
+        self.name_entry.grid(row=1, column=0)
 
         self.command_entry = ttk.Entry(form, width=18)
-        self.command_entry.grid(row=1, column=1, padx=4)
+        self.command_entry.grid(row=1, column=1)
 
-        self.price_entry = ttk.Entry(form, width=8)
-        self.price_entry.grid(row=1, column=2, padx=4)
+        self.price_entry = ttk.Entry(form, width=8, validate='key', validatecommand=self._vcmd_int)
+        self.price_entry.grid(row=1, column=2)
 
         self.roles_entry = ttk.Entry(form, width=12)
-        self.roles_entry.grid(row=1, column=3, padx=4)
+        self.roles_entry.grid(row=1, column=3)
 
         self.limit_var = tk.BooleanVar()
-        ttk.Checkbutton(form, text='Limit', variable=self.limit_var).grid(row=1, column=4, padx=4)
+        ttk.Checkbutton(form, text='Limit', variable=self.limit_var).grid(row=1, column=4)
 
         self.desc_entry = ttk.Entry(form, width=25)
-        self.desc_entry.grid(row=1, column=5, padx=4)
+        self.desc_entry.grid(row=1, column=5)
 
         # ---------------- Command Builder Extra Fields ----------------
         # Quantity
-        ttk.Label(form, text='Qty').grid(row=2, column=0, padx=4)
+        ttk.Label(form, text='Qty').grid(row=2, column=0)
         self.qty_var = tk.IntVar(value=1)
-        ttk.Entry(form, textvariable=self.qty_var, width=6).grid(row=3, column=0, padx=4)
+        ttk.Entry(form, textvariable=self.qty_var, width=6, validate='key', validatecommand=self._vcmd_int).grid(row=3, column=0)
 
         # Quality
-        ttk.Label(form, text='Quality').grid(row=2, column=1, padx=4)
+        ttk.Label(form, text='Quality').grid(row=2, column=1)
         self.quality_var = tk.IntVar(value=1)
-        ttk.Entry(form, textvariable=self.quality_var, width=6).grid(row=3, column=1, padx=4)
+        ttk.Entry(form, textvariable=self.quality_var, width=6, validate='key', validatecommand=self._vcmd_int).grid(row=3, column=1)
 
         # Is Blueprint Checkbox
         self.is_bp_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(form, text='Is BP', variable=self.is_bp_var).grid(row=3, column=2, padx=4)
+        ttk.Checkbutton(form, text='Is BP', variable=self.is_bp_var).grid(row=3, column=2)
 
         # Level for Dinos
-        ttk.Label(form, text='Level').grid(row=2, column=3, padx=4)
+        ttk.Label(form, text='Level').grid(row=2, column=3)
         self.level_var = tk.IntVar(value=224)
-        ttk.Entry(form, textvariable=self.level_var, width=6).grid(row=3, column=3, padx=4)
+        ttk.Entry(form, textvariable=self.level_var, width=6, validate='key', validatecommand=self._vcmd_int).grid(row=3, column=3)
 
         # Breedable Checkbox for Dinos
         self.breedable_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(form, text='Breedable', variable=self.breedable_var).grid(row=3, column=4, padx=4)
+        ttk.Checkbutton(form, text='Breedable', variable=self.breedable_var).grid(row=3, column=4)
 
         # Generate Command Button
-        ttk.Button(form, text='Generate Command', command=self._generate_command).grid(row=3, column=5, padx=4)
+        ttk.Button(form, text='Generate Command', command=self._generate_command).grid(row=3, column=5)
 
         # ---------------- Item Buttons ----------------
         btnf2 = ttk.Frame(f)
@@ -403,15 +752,93 @@ class WrecksShopLauncher(tk.Tk):
         self.command_entry.insert(0, cmd)
 
     
+    def _json_changed(self, path):
+        """True if path changed on disk since we last read or wrote it; records the new mtime."""
+        try: mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError: mtime = None
+        if path in self._json_mtimes and self._json_mtimes[path] == mtime: return False
+        self._json_mtimes[path] = mtime
+        return True
+
+    def _store_busy(self, path, save):
+        """True while an edit to path is queued or being written; reloading now would drop it."""
+        return save in self._pending_saves or path in self._writes_in_flight
+
+    @staticmethod
+    def _read_json(path, default):
+        """Parse a JSON store, or return default if the file doesn't exist."""
+        try:
+            with open(path,'rb') as f: return json.loads(f.read())
+        except FileNotFoundError:
+            return default
+
+    def _load_shop_store(self):
+        """Read shop_items.json; the shop page works from this copy until the file changes."""
+        if self._store_busy(SHOP_ITEMS_PATH, self._save_shop_store) or not self._json_changed(SHOP_ITEMS_PATH): return
+        self.shop_store=self._read_json(SHOP_ITEMS_PATH,{})
+        self.categories=list(self.shop_store.keys())
+        self.cat_combo['values']=self.categories
+        self._refresh_shop_items()
+
+    def _write_json(self, path, data):
+        """Serialize data now, on the Tk thread, and write it from the writer thread."""
+        self._writes_in_flight[path] = self._writes_in_flight.get(path, 0) + 1
+        self._run_async(self._write_file, path, json.dumps(data,indent=2), pool=self._writer,
+                        done=partial(self._file_written, path))
+
+    @staticmethod
+    def _write_file(path, text):
+        """Returns (new mtime, None), or (None, error message) if the write failed."""
+        # Write beside the store and swap it in, so a crash mid-write can't leave it truncated
+        tmp = f'{path}.tmp'
+        try:
+            with open(tmp,'w') as f:
+                f.write(text)
+                # On disk before the rename, or power loss could leave the swapped-in file empty
+                f.flush(); os.fsync(f.fileno())
+            os.replace(tmp, path)
+            return os.stat(path).st_mtime_ns, None
+        except OSError as e:
+            try: os.remove(tmp)
+            except OSError: pass
+            return None, str(e)
+
+    def _file_written(self, path, result):
+        mtime, error = result
+        n = self._writes_in_flight.pop(path) - 1
+        if n: self._writes_in_flight[path] = n
+        if error: self._log(f"Could not save {path}: {error}")
+        else: self._json_mtimes[path] = mtime  # our own write; don't read it back
+
+    def _save_shop_store(self): self._write_json(SHOP_ITEMS_PATH, self.shop_store)
+
+    @staticmethod
+    def _shop_row(itm):
+        """Treeview values for a single shop item."""
+        roles = itm.get('roles',[])
+        if roles != 'all': roles = ','.join(roles)
+        return (itm['name'],itm['command'],itm['price'],itm['limit'],roles,
+                ENABLED_TEXT[bool(itm.get('enabled',True))],itm.get('description',''))
+
+    def _on_category_select(self):
+        # <<ComboboxSelected>> also fires when the shown category is picked again
+        if self.cat_combo.get().strip() != self._shown_cat:
+            self._refresh_shop_items()
+
     def _refresh_shop_items(self):
-        self.item_tv.delete(*self.item_tv.get_children())
-        if os.path.exists(SHOP_ITEMS_PATH):
-            store = json.load(open(SHOP_ITEMS_PATH,'r'))
-            for itm in store.get(self.cat_combo.get().strip(),[]):
-                roles = 'all' if itm.get('roles')=='all' else ','.join(itm.get('roles',[]))
-                enabled = 'Yes' if itm.get('enabled',True) else 'No'
-                desc = itm.get('description','')
-                self.item_tv.insert('', 'end', values=(itm['name'],itm['command'],itm['price'],itm['limit'],roles,enabled,desc))
+        """Bring item_tv in line with the selected category, touching only rows that changed."""
+        tv = self.item_tv
+        cat = self.cat_combo.get().strip()
+        if cat != self._shown_cat: tv.selection_set(())
+        self._shown_cat = cat
+        rows = [self._shop_row(itm) for itm in self.shop_store.get(cat,[])]
+        shown = self._shown_rows
+        # iids are row positions, so row i of one refresh is row i of the next
+        for i, values in enumerate(rows):
+            if i >= len(shown): tv.insert('', 'end', iid=i, values=values)
+            elif values != shown[i]: tv.item(i, values=values)
+        if len(shown) > len(rows): tv.delete(*range(len(rows), len(shown)))
+        self._shown_rows = rows
 
     def _add_category(self):
         name = simpledialog.askstring('Category','Enter category name:')
@@ -422,11 +849,10 @@ class WrecksShopLauncher(tk.Tk):
 
     def _toggle_category_enabled(self):
         cat = self.cat_combo.get().strip()
-        store=json.load(open(SHOP_ITEMS_PATH,'r'))
-        items=store.get(cat,[])
+        items=self.shop_store.get(cat,[])
         any_on=any(itm.get('enabled',True) for itm in items)
         for itm in items: itm['enabled']=not any_on
-        json.dump(store,open(SHOP_ITEMS_PATH,'w'),indent=2)
+        self._schedule_save(self._save_shop_store)
         self._refresh_shop_items()
         self._log(f"Category {cat} {'disabled' if any_on else 'enabled'}")
 
@@ -437,23 +863,23 @@ class WrecksShopLauncher(tk.Tk):
         price=self.price_entry.get().strip(); roles=self.roles_entry.get().strip()
         desc=self.desc_entry.get().strip(); limit=self.limit_var.get()
         try: price_val=int(price)
-        except: messagebox.showerror('Error','Price must be integer'); return
+        except ValueError: messagebox.showerror('Error','Price must be integer'); return
         roles_val='all' if roles=='all' else [r.strip() for r in roles.split(',')]
         itm={'name':name,'command':cmd,'price':price_val,'limit':limit,'roles':roles_val,'enabled':True,'description':desc}
-        store=json.load(open(SHOP_ITEMS_PATH,'r')) if os.path.exists(SHOP_ITEMS_PATH) else {}
-        store.setdefault(cat,[]).append(itm)
-        json.dump(store,open(SHOP_ITEMS_PATH,'w'),indent=2)
+        self.shop_store.setdefault(cat,[]).append(itm)
+        self._schedule_save(self._save_shop_store)
         self._refresh_shop_items(); self._log(f"Added item {name}")
 
     def _toggle_item_enabled(self):
         sel=self.item_tv.selection();
         if not sel: return
-        idx=self.item_tv.index(sel); cat=self.cat_combo.get().strip()
-        store=json.load(open(SHOP_ITEMS_PATH,'r'))
-        items=store.get(cat,[])
+        idx=self.item_tv.index(sel[0]); cat=self.cat_combo.get().strip()
+        items=self.shop_store.get(cat,[])
         items[idx]['enabled']=not items[idx].get('enabled',True)
-        json.dump(store,open(SHOP_ITEMS_PATH,'w'),indent=2)
-        self._refresh_shop_items()
+        self._schedule_save(self._save_shop_store)
+        # Only the Enabled cell changed; rewrite that row instead of reloading the tree
+        self._shown_rows[idx] = values = self._shop_row(items[idx])
+        self.item_tv.item(sel[0], values=values)
         state='enabled' if items[idx]['enabled'] else 'disabled'
         self._log(f"Item {items[idx]['name']} {state}")
 
@@ -461,26 +887,37 @@ class WrecksShopLauncher(tk.Tk):
     def _build_library_page(self):
         f=self.pages['Data Library']
         ttk.Label(f,text='Category').pack(anchor='w',pady=5)
-        self.lib_type_var=tk.StringVar()
-        self.lib_combo=ttk.Combobox(f,textvariable=self.lib_type_var,state='readonly')
+        self.lib_combo=ttk.Combobox(f,state='readonly')
         self.lib_combo.pack(fill='x',padx=5)
         self.lib_combo.bind('<<ComboboxSelected>>',lambda e:self._on_type_select())
+        ttk.Label(f,text='Search').pack(anchor='w',pady=5)
+        self.lib_search=ttk.Entry(f)
+        self.lib_search.pack(fill='x',padx=5)
+        self.lib_search.bind('<KeyRelease>',self._on_lib_search)
+        self._lib_fill_id=self._lib_search_id=None
+        self._lib_shown_term=None   # search term the tree currently reflects
+        # Empty until _on_type_select picks a section, which waits for the library to load
+        self._lib_section={}; self._lib_filter_cache={'': []}
         btnf=ttk.Frame(f); btnf.pack(pady=5)
         ttk.Button(btnf,text='Refresh Base Data',command=self._refresh_base_library).pack(side='left',padx=5)
         ttk.Button(btnf,text='Import Mods…',command=self._import_mods).pack(side='left',padx=5)
-        cols=('Name','Blueprint','Mod')
-        self.lib_tv=ttk.Treeview(f,columns=cols,show='headings')
-        for c in cols: self.lib_tv.heading(c,text=c)
-        self.lib_tv.pack(expand=True,fill='both',pady=5)
+        self.lib_tv=self._make_tree(f,('Name','Blueprint','Mod'))
         ttk.Button(f,text='Import Selection',command=self._on_lib_import).pack(pady=5)
+        self._populate_library_types()
 
     def _refresh_base_library(self):
-        self.library=update_base_library(); self._populate_library_types(); self._log('Base data refreshed')
+        self._run_async(update_base_library,done=partial(self._library_loaded,'Base data refreshed'))
 
     def _import_mods(self):
         d=filedialog.askdirectory(title='Select Mods Folder')
         if not d: return
-        self.library=update_full_library(Path(d)); self._populate_library_types(); self._log('Mod data imported')
+        self._run_async(update_full_library,Path(d),done=partial(self._library_loaded,'Mod data imported'))
+
+    def _library_loaded(self, msg, library):
+        self._set_library(library)
+        # An unbuilt page picks the library up when it is first shown
+        if 'Data Library' not in self._lazy_pages: self._populate_library_types()
+        if msg: self._log(msg)
 
     def _populate_library_types(self):
         types=sorted(self.library.keys())
@@ -489,42 +926,112 @@ class WrecksShopLauncher(tk.Tk):
             self.lib_combo.current(0); self._on_type_select()
 
     def _on_type_select(self):
-        section = self.lib_type_var.get()
+        # Rows are only diffable within one section; names can repeat across sections
         self.lib_tv.delete(*self.lib_tv.get_children())
-
+        self._lib_section, rows = self._lib_view(self.lib_combo.get())
+        # Search term -> matching rows, least recently used first; '' is the whole
+        # section and is never evicted
+        self._lib_filter_cache = {'': rows}
+        self._lib_shown_term = None
+        self._apply_lib_filter()
+
+    def _lib_view(self, section):
+        """(name -> entry, sorted display rows) for a section, built once per library load."""
+        view = self._lib_views.get(section)
+        if view: return view
         entries = self.library.get(section, [])
-        # If it’s a dict (new-style), items() works. If it’s a list, convert to (name, item).
-        if isinstance(entries, dict):
-            iterable = entries.items()
+        # If it’s a dict (new-style), use it as is. If it’s a list, key it by name.
+        if not isinstance(entries, dict):
+            entries = {item.name: item for item in entries}
+
+        # (lowercased name, row values) for every entry
+        rows = []
+        append = rows.append
+        for name, entry in entries.items():
+            # Base rows are ArkItems, mod rows are the raw JSON dicts
+            if isinstance(entry, dict):
+                bp, mod = entry.get('blueprint',''), entry.get('mod','')
+            else:
+                bp, mod = entry.blueprint, entry.mod
+            append((name.lower(), (name, bp, mod)))
+        # Alphabetical, on the lowercased name already in each row; filtered
+        # lists keep this order, so the section is sorted once
+        rows.sort(key=itemgetter(0))
+        self._lib_views[section] = view = (entries, rows)
+        return view
+
+    def _on_lib_search(self, event):
+        if event.keysym in NON_EDIT_KEYS: return
+        # Restart the wait on every key so a word being typed is filtered once
+        if self._lib_search_id: self.after_cancel(self._lib_search_id)
+        self._lib_search_id = self.after(LIB_SEARCH_MS, self._apply_lib_filter)
+
+    def _apply_lib_filter(self):
+        if self._lib_search_id:
+            self.after_cancel(self._lib_search_id); self._lib_search_id = None
+        term = self.lib_search.get().strip().lower()
+        # Navigation keys, trailing spaces and the like leave the term as it was
+        if term == self._lib_shown_term: return
+        self._lib_shown_term = term
+        cache = self._lib_filter_cache
+        rows = cache.get(term)
+        if rows is not None:
+            if term: cache[term] = cache.pop(term)
         else:
-            iterable = [(item.name, item) for item in entries]
-
-        for name, entry in iterable:
-            bp  = getattr(entry, 'blueprint', '') or entry.get('blueprint','')
-            mod = getattr(entry, 'mod', '') or entry.get('mod','')
-            self.lib_tv.insert('', 'end', values=(name, bp, mod))
+            # Anything containing term also contains each of its prefixes, so start
+            # from the longest prefix already filtered instead of the whole section
+            base = next(cache[term[:k]] for k in range(len(term)-1, -1, -1) if term[:k] in cache)
+            rows = [r for r in base if term in r[0]]
+            if len(cache) >= LIB_FILTER_CACHE: del cache[next(k for k in cache if k)]
+            cache[term] = rows
+        # A fill still running for an older term or section is dropped
+        if self._lib_fill_id:
+            self.after_cancel(self._lib_fill_id); self._lib_fill_id = None
+        # Every list of rows is a subsequence of the section's sorted rows, so the
+        # tree can be diffed: drop rows that stopped matching, then insert only the
+        # missing ones, each at its index in the new list
+        tv = self.lib_tv
+        shown = set(tv.get_children())
+        stale = shown.difference([values[0] for _, values in rows])
+        if stale: tv.delete(*stale)
+        missing = [(i, values) for i, (_, values) in enumerate(rows) if values[0] not in shown]
+        self._fill_lib_rows(missing, 0)
+
+    def _fill_lib_rows(self, rows, start):
+        """Insert one chunk of (index, values) rows, then let Tk draw and take input before the next."""
+        end = start + LIB_FILL_CHUNK
+        # Local binding: this loop runs once per inserted row
+        insert = self.lib_tv.insert
+        for i, values in rows[start:end]:
+            insert('', i, iid=values[0], values=values)
+        self._lib_fill_id = self.after(1, self._fill_lib_rows, rows, end) if end < len(rows) else None
+
+    def _set_library(self, library):
+        """Install a loaded library and index it by lowercased name for _find_ark_item."""
+        self.library = library
+        index = {}
+        for items in library.values():
+            named = items.items() if isinstance(items, dict) else ((item.name, item) for item in items)
+            # First section wins, as with the old front-to-back scan
+            for name, item in named: index.setdefault(name.lower(), item)
+        self._lib_by_lower = index
+        # Per-section display rows, rebuilt lazily by _lib_view
+        self._lib_views = {}
 
     def _find_ark_item(self, item_name):
-        """Search for an ArkItem by name in the loaded library."""
-        for section_name, items in self.library.items():
-            if isinstance(items, dict):
-                for name, item in items.items():
-                    if name.lower() == item_name.lower():
-                        return item
-            else:
-                for item in items:
-                    if item.name.lower() == item_name.lower():
-                        return item
-        return None
+        """Look up an ArkItem by name (case-insensitive) in the loaded library."""
+        return self._lib_by_lower.get(item_name.lower())
 
     def _on_lib_import(self):
         sel=self.lib_tv.selection();
         if not sel: return
-        name,bp,mod=self.lib_tv.item(sel,'values')
+        name=sel[0]; entry=self._lib_section[name]
         self.name_entry.delete(0,'end'); self.name_entry.insert(0,name)
-        try: ark_item=ArkItem(section=self.lib_type_var.get(),name=name,blueprint=bp,mod=mod)
-        except: ark_item=ArkItem(section='',name=name,blueprint=bp,mod=mod)
-        if self.lib_type_var.get().lower().startswith('dino'):
+        section=self.lib_combo.get()
+        # Base entries already are ArkItems; mod entries are raw JSON dicts
+        if isinstance(entry, ArkItem): ark_item=entry
+        else: ark_item=ArkItem(section=section,name=name,blueprint=entry.get('blueprint',''),mod=entry.get('mod',''))
+        if section.lower().startswith('dino'):
             cmd=command_builders.build_spawn_dino_command(eos_id='{eos}',item=ark_item,level=1,breedable=False)
         else:
             cmd=command_builders.build_giveitem_command(player_id='{player}',item=ark_item,qty=1,quality=1,is_bp=False)
@@ -534,109 +1041,213 @@ class WrecksShopLauncher(tk.Tk):
     # Admin Roles Page
     def _build_admins_page(self):
         f=self.pages['Admin Roles']
-        cols=('ID','Name','Desc')
-        self.admin_tv=ttk.Treeview(f,columns=cols,show='headings')
-        for c in cols: self.admin_tv.heading(c,text=c)
-        self.admin_tv.pack(expand=True,fill='both',pady=5)
+        self.admin_tv=self._make_tree(f,('ID','Name','Desc'))
         bf=ttk.Frame(f); bf.pack()
         ttk.Button(bf,text='Add',command=self._add_admin_role).pack(side='left',padx=5)
         ttk.Button(bf,text='Remove',command=self._remove_admin_role).pack(side='left',padx=5)
 
+    # Treeview values for an admin role
+    _admin_row = staticmethod(itemgetter('id','name','desc'))
+
     def _load_admin_roles(self):
-        self.admin_roles=json.load(open(ADMIN_ROLES_PATH)) if os.path.exists(ADMIN_ROLES_PATH) else []
+        if self._store_busy(ADMIN_ROLES_PATH, self._save_admin_roles) or not self._json_changed(ADMIN_ROLES_PATH): return
+        self.admin_roles=self._read_json(ADMIN_ROLES_PATH,[])
+        self._admin_ids={r['id'] for r in self.admin_roles}
         self.admin_tv.delete(*self.admin_tv.get_children())
-        for r in self.admin_roles: self.admin_tv.insert('', 'end', values=(r['id'],r['name'],r['desc']))
+        insert, row = self.admin_tv.insert, self._admin_row
+        for r in self.admin_roles: insert('', 'end', values=row(r))
 
-    def _save_admin_roles(self): json.dump(self.admin_roles,open(ADMIN_ROLES_PATH,'w'),indent=2)
+    def _save_admin_roles(self): self._write_json(ADMIN_ROLES_PATH, self.admin_roles)
 
     def _add_admin_role(self):
         rid=simpledialog.askstring('Role ID','Discord Role ID:')
+        if rid in self._admin_ids:
+            messagebox.showerror('Error',f'Role {rid} is already an admin role'); return
         name=simpledialog.askstring('Name','Role name:')
         if rid and name:
             role={'id':rid,'name':name,'desc':name}
-            self.admin_roles.append(role); self._save_admin_roles(); self._load_admin_roles(); self._log(f"Added admin {name}")
+            self.admin_roles.append(role); self._admin_ids.add(rid); self._schedule_save(self._save_admin_roles)
+            self.admin_tv.insert('', 'end', values=self._admin_row(role)); self._log(f"Added admin {name}")
 
     def _remove_admin_role(self):
         sel=self.admin_tv.selection();
         if sel:
-            idx=self.admin_tv.index(sel); name=self.admin_roles.pop(idx)['name']; self._save_admin_roles(); self._load_admin_roles(); self._log(f"Removed admin {name}")
+            idx=self.admin_tv.index(sel[0]); role=self.admin_roles.pop(idx); name=role['name']
+            self._admin_ids.discard(role['id']); self._schedule_save(self._save_admin_roles)
+            self.admin_tv.delete(sel[0]); self._log(f"Removed admin {name}")
 
     # Discounts Page
     def _build_discounts_page(self):
         f=self.pages['Discounts']
-        cols=('Name','Type','Target','Amount')
-        self.disc_tv=ttk.Treeview(f,columns=cols,show='headings')
-        for c in cols: self.disc_tv.heading(c,text=c)
-        self.disc_tv.pack(expand=True,fill='both',pady=5)
+        self.disc_tv=self._make_tree(f,('Name','Type','Target','Amount'))
         bf=ttk.Frame(f); bf.pack()
         ttk.Button(bf,text='Add',command=self._add_discount).pack(side='left',padx=5)
         ttk.Button(bf,text='Remove',command=self._remove_discount).pack(side='left',padx=5)
+        # Add dialog, created on first use and kept for later ones
+        self._disc_form=None
+
+    # Treeview values for a discount
+    _disc_row = staticmethod(itemgetter('name','type','target','amount'))
 
     def _load_discounts(self):
-        self.discounts=json.load(open(DISCOUNTS_PATH)) if os.path.exists(DISCOUNTS_PATH) else []
+        if self._store_busy(DISCOUNTS_PATH, self._save_discounts) or not self._json_changed(DISCOUNTS_PATH): return
+        self.discounts=self._read_json(DISCOUNTS_PATH,[])
         self.disc_tv.delete(*self.disc_tv.get_children())
-        for d in self.discounts: self.disc_tv.insert('', 'end', values=(d['name'],d['type'],d['target'],d['amount']))
+        insert, row = self.disc_tv.insert, self._disc_row
+        for d in self.discounts: insert('', 'end', values=row(d))
 
-    def _save_discounts(self): json.dump(self.discounts,open(DISCOUNTS_PATH,'w'),indent=2)
+    def _save_discounts(self): self._write_json(DISCOUNTS_PATH, self.discounts)
 
     def _add_discount(self):
-        name=simpledialog.askstring('Name','Discount name:')
-        dtype=simpledialog.askstring('Type','"role" or "event":')
-        target=simpledialog.askstring('Target','Role ID or Event name:')
-        amt=simpledialog.askfloat('Amount','Percent:')
-        if name and dtype and target and amt is not None:
+        if self._disc_form is None:
+            self._disc_form=FormDialog(self,'Add Discount',[('name','Discount name:'),('type','"role" or "event":'),
+                                                            ('target','Role ID or Event name:'),('amount','Percent:')])
+        vals=self._disc_form.ask()
+        if not vals: return
+        name,dtype,target=vals['name'],vals['type'],vals['target']
+        try: amt=float(vals['amount'])
+        except ValueError: messagebox.showerror('Error','Percent must be a number'); return
+        if name and dtype and target:
             d={'name':name,'type':dtype,'target':target,'amount':amt}
-            self.discounts.append(d); self._save_discounts(); self._load_discounts(); self._log(f"Added discount {name}")
+            self.discounts.append(d); self._schedule_save(self._save_discounts)
+            self.disc_tv.insert('', 'end', values=self._disc_row(d)); self._log(f"Added discount {name}")
 
     def _remove_discount(self):
         sel=self.disc_tv.selection();
         if sel:
-            idx=self.disc_tv.index(sel); name=self.discounts.pop(idx)['name']; self._save_discounts(); self._load_discounts(); self._log(f"Removed discount {name}")
+            idx=self.disc_tv.index(sel[0]); name=self.discounts.pop(idx)['name']; self._schedule_save(self._save_discounts)
+            self.disc_tv.delete(sel[0]); self._log(f"Removed discount {name}")
 
     # Control Page
     def _build_control_page(self):
         f=self.pages['Control']
-        self.status_var=tk.StringVar(value='Stopped')
         sf=ttk.Frame(f); sf.pack(padx=10,pady=10)
         ttk.Label(sf,text='Bot Status:').pack(side='left')
-        self.status_lbl=ttk.Label(sf,textvariable=self.status_var,foreground='red'); self.status_lbl.pack(side='left',padx=5)
+        self.status_lbl=ttk.Label(sf,text='Stopped',style='Error.TLabel'); self.status_lbl.pack(side='left',padx=5)
         btnf=ttk.Frame(f); btnf.pack(pady=10)
         self.start_btn=ttk.Button(btnf,text='Start Bot',command=self.start_bot); self.start_btn.pack(side='left',padx=5)
         self.stop_btn=ttk.Button(btnf,text='Stop Bot',command=self.stop_bot,state='disabled'); self.stop_btn.pack(side='left',padx=5)
+        self._bot_status=self._bot_status_pending='Stopped'
+        self._status_idle_id=None
+
+    def _set_bot_status(self,status):
+        """Request a BOT_STATUS entry; the widgets are updated together at idle."""
+        self._bot_status_pending=status
+        if self._status_idle_id is None:
+            self._status_idle_id=self.after_idle(self._apply_bot_status)
+
+    def _apply_bot_status(self):
+        self._status_idle_id=None
+        status=self._bot_status_pending
+        if status==self._bot_status: return
+        self._bot_status=status
+        style,start,stop=BOT_STATUS[status]
+        self.status_lbl.config(text=status,style=style)
+        self.start_btn.config(state=start); self.stop_btn.config(state=stop)
 
     def start_bot(self):
         if self.process: return
         self.process=subprocess.Popen(['python','Discord_Shop_System.py'],stdout=subprocess.PIPE,stderr=subprocess.STDOUT,text=True)
-        self.start_btn.config(state='disabled'); self.stop_btn.config(state='normal'); self.status_var.set('Running'); self.status_lbl.config(foreground='green')
-        self._log('Bot started'); self._read_output()
+        self._set_bot_status('Running')
+        self._log('Bot started')
+        threading.Thread(target=self._read_output,args=(self.process,),daemon=True).start()
+        self._watch_id=self.after(BOT_WATCH_MS,self._watch_bot)
+
+    def _watch_bot(self):
+        """Tk-thread tick: notice when the bot exits without Stop being pressed."""
+        self._watch_id=None
+        if not self.process or self._stopping: return
+        code=self.process.poll()
+        if code is not None:
+            self._bot_stopped(f'Bot exited (code {code})'); return
+        self._watch_id=self.after(BOT_WATCH_MS,self._watch_bot)
 
     def stop_bot(self):
-        if not self.process: return
-        self.process.terminate(); self.process.wait(5); self.process=None
-        self.start_btn.config(state='normal'); self.stop_btn.config(state='disabled'); self.status_var.set('Stopped'); self.status_lbl.config(foreground='red')
-        self._log('Bot stopped')
-
-    def _read_output(self):
-        if self.process and self.process.poll() is None:
-            line=self.process.stdout.readline()
-            if line: self._log(line.strip())
-            self.after(100,self._read_output)
+        if not self.process or self._stopping: return
+        self._stopping=True
+        if self._watch_id: self.after_cancel(self._watch_id); self._watch_id=None
+        self._set_bot_status('Stopping...')
+        # terminate()/wait() can take seconds; keep them off the Tk thread
+        self._run_async(self._terminate_bot,self.process,done=lambda code: self._bot_stopped())
+
+    @staticmethod
+    def _terminate_bot(proc):
+        """Worker: stop the bot process, killing it if it ignores terminate()."""
+        proc.terminate()
+        try: return proc.wait(5)
+        except subprocess.TimeoutExpired:
+            proc.kill(); return proc.wait()
+
+    def _bot_stopped(self,msg='Bot stopped'):
+        self.process=None; self._stopping=False
+        self._set_bot_status('Stopped')
+        self._log(msg)
+
+    def _read_output(self,proc):
+        """Reader thread: forward bot output to the log queue until the pipe closes.
+
+        Lines only go into the _log deque; _flush_log coalesces them into one
+        widget update per tick however fast the bot prints.
+        """
+        for line in proc.stdout:
+            self._log(line.rstrip())
 
     # Logs Page
     def _build_logs_page(self):
         f=self.pages['Logs']
-        self.log_box=ScrolledText(f,state='disabled',font=('Consolas',10))
+        self.log_box=ScrolledText(f,state='disabled',font=self.mono_font)
         self.log_box.pack(expand=True,fill='both',pady=5)
+        self._log_lines=0
+        self._log_ring=deque(maxlen=LOG_MAX_LINES)   # last N messages, used for Save Log
+        self._logs_visible=False
+        # Queued by _log, drained by _flush_log. Bounded like the ring: anything older
+        # would be trimmed on the next flush anyway, so a bot flooding stdout can't grow it
+        self._log_pending=deque(maxlen=LOG_MAX_LINES)
+        self._ts_second=-1; self._ts_text=''
+        self.after(LOG_FLUSH_MS,self._flush_log)
         ttk.Button(f,text='Save Log',command=self._save_log).pack(pady=5)
+        self.log_status=ttk.Label(f,text='',style='Ok.TLabel'); self.log_status.pack()
+
+    def _now_hms(self):
+        """HH:MM:SS for the current second; strftime runs at most once per second."""
+        now=int(time.time())
+        if now!=self._ts_second:
+            self._ts_text=time.strftime('%H:%M:%S',time.localtime(now)); self._ts_second=now
+        return self._ts_text
 
     def _log(self,msg):
-        self.log_box.config(state='normal'); self.log_box.insert('end',msg+"\n"); self.log_box.config(state='disabled')
+        """Queue msg for the Logs page; cheap, and safe to call from worker threads."""
+        line=_fmt_log(ts=self._now_hms(), msg=msg)
+        self._log_ring.append(line); self._log_pending.append(line)
+
+    def _flush_log(self):
+        # The Text widget is only written while it can be seen; the queue keeps
+        # the newest lines until the Logs tab is opened
+        if self._logs_visible: self._drain_log()
+        self.after(LOG_FLUSH_MS,self._flush_log)
+
+    def _drain_log(self):
+        """Write everything queued since the last tick in a single Text insert."""
+        pending=self._log_pending
+        if pending:
+            text="\n".join([pending.popleft() for _ in range(len(pending))])
+            # Follow the tail only if the user hasn't scrolled up to read older lines
+            follow=self.log_box.yview()[1]>=1.0
+            self.log_box.config(state='normal'); self.log_box.insert('end',text+"\n")
+            # Count lines as they are added; never read the widget back to measure it
+            self._log_lines+=text.count("\n")+1
+            if self._log_lines>LOG_MAX_LINES:
+                self.log_box.delete('1.0',f'{self._log_lines-LOG_KEEP_LINES+1}.0'); self._log_lines=LOG_KEEP_LINES
+            if follow: self.log_box.see('end')
+            self.log_box.config(state='disabled')
 
     def _save_log(self):
         path=filedialog.asksaveasfilename(defaultextension='.txt')
         if path:
-            open(path,'w').write(self.log_box.get('1.0','end'))
-            messagebox.showinfo('Saved',f'Log saved to {path}')
+            # Stream the ring straight to disk; no Text.get() copy, no joined string
+            with open(path,'w',encoding='utf-8',buffering=1<<16) as f:
+                f.writelines(line+"\n" for line in self._log_ring)
+            self._toast(self.log_status,f'Log saved to {path}')
 
 if __name__=='__main__':
     app=WrecksShopLauncher(); app.mainloop()